@@ -17,120 +17,190 @@ Layout:
 - Case folder name: (case_)?<speciesID>_<authorID>
 - Mixed types in the same folder are allowed; the builder emits one case per type.
 """
-import json, re, sys
-from itertools import chain
+import json, os, re, sys
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 
+try:  # optional: faster encoder, same output
+    import orjson
+except ImportError:
+    orjson = None
+
 ROOT = Path(__file__).resolve().parents[1]
 IMG_DIR = ROOT / "images"
+ROOT_PREFIX = os.path.join(str(ROOT), "")  # ROOT plus trailing separator
 
-TYPE_TO_SLUG = {
-    "inversion": "inversions",
-    "translocation": "translocations",
-    "duplication": "duplications",
-}
 SLUG_ORDER = ["inversions", "translocations", "duplications"]
+# <type> -> index into SLUG_ORDER, for the per-type lists in process_case/build_data
+TYPES = ["inversion", "translocation", "duplication"]
+TYPE_IDX = {t: i for i, t in enumerate(TYPES)}
+
+# one gallery image while a case is being assembled; pngs arrive already in XX order
+Img = namedtuple("Img", "src alt caption")
 
-CASE_DIR_RE = re.compile(r"^(?:case_)?[A-Za-z0-9]+_[A-Za-z0-9]+$")
+# Matched against the PNG name with its (.png|.PNG) extension cut off via endpos;
+# list_pngs_sorted has already checked the extension.
 FILE_RE = re.compile(
-    r"^(inversion|duplication|translocation)_([A-Za-z0-9]+)_([A-Za-z0-9]+)_(\d{2})\.(?:png|PNG)$"
+    r"^(inversion|duplication|translocation)_([A-Za-z0-9]+)_([A-Za-z0-9]+)_(\d{2})$"
 )
 
+def _alnum(s: str) -> bool:
+    return s.isascii() and s.isalnum()  # [A-Za-z0-9]+
+
+def valid_case_name(name: str) -> bool:
+    """(case_)?<speciesID>_<authorID>, with alphanumeric IDs."""
+    parts = name.split("_")
+    if len(parts) == 3 and parts[0] == "case":
+        parts = parts[1:]
+    return len(parts) == 2 and _alnum(parts[0]) and _alnum(parts[1])
+
 def human_case_name(folder: str) -> str:
-    base = re.sub(r"^case_", "", folder)
+    base = folder.removeprefix("case_")
     sp, _, au = base.partition("_")
     return f"{sp} — {au}" if au else base
 
-def rel(p: Path) -> str:
-    return str(p.relative_to(ROOT)).replace("\\", "/")
-
-def list_pngs_sorted(case_dir: Path):
+def rel(p: str) -> str:
+    # p is always a scandir path under IMG_DIR, so ROOT is a plain string prefix
+    return p[len(ROOT_PREFIX):].replace("\\", "/")
+
+def list_case_dirs() -> list[os.DirEntry]:
+    """Return the case folders under images/, sorted case-insensitively by name."""
+    with os.scandir(IMG_DIR) as it:
+        decorated = [(e.name.lower(), e) for e in it if e.is_dir()]
+    decorated.sort(key=itemgetter(0))
+    return [e for _, e in decorated]
+
+@lru_cache(maxsize=None)
+def list_pngs_sorted(case_dir: str):
+    """Scan case_dir once; return (pngs, covers, txts).
+
+    pngs is (sort_key, name, path, groups) for each PNG, in gallery order, where
+    sort_key is (XX, lowercased name) and groups holds the FILE_RE match groups
+    or None for a non-conforming name.
+    covers is the set of cover*.png names present in the folder and txts the
+    set of caption .txt paths.
+
+    Cached per folder: validation and the build both walk every case.
+    """
     items = []
-    for p in chain(case_dir.glob("*.png"), case_dir.glob("*.PNG")):
-        m = FILE_RE.match(p.name)
-        order = int(m.group(4)) if m else 9999
-        items.append((order, p))
-    return sorted(items, key=lambda t: (t[0], t[1].name.lower()))
-
-def caption_for(png: Path) -> str:
-    txt = png.with_suffix(".txt")
-    return txt.read_text(encoding="utf-8").strip() if txt.exists() else ""
-
-def validate_case(case_dir: Path) -> list[str]:
+    covers = set()
+    txts = set()
+    with os.scandir(case_dir) as it:
+        for e in it:
+            if e.name.endswith(".txt"):
+                if e.is_file():
+                    txts.add(e.path)
+                continue
+            if not (e.name.endswith((".png", ".PNG")) and e.is_file()):
+                continue
+            if e.name.startswith("cover"):
+                covers.add(e.name)
+            # the <type> token alone rules out most strays (cover*.png etc.) without the regex
+            m = None
+            if e.name.partition("_")[0] in TYPE_IDX:
+                m = FILE_RE.match(e.name, 0, len(e.name) - 4)
+            groups = m.groups() if m else None
+            order = int(groups[3]) if groups else 9999
+            items.append(((order, e.name.lower()), e.name, e.path, groups))
+    items.sort(key=itemgetter(0))
+    return tuple(items), frozenset(covers), frozenset(txts)
+
+def caption_for(png: str, txts: frozenset[str]) -> str:
+    txt = png[:-4] + ".txt"
+    if txt not in txts:
+        return ""
+    try:
+        with open(txt, encoding="utf-8") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return ""
+
+def validate_case(case_dir: os.DirEntry) -> list[str]:
     problems = []
-    if not CASE_DIR_RE.match(case_dir.name):
+    if not valid_case_name(case_dir.name):
         problems.append(f"Bad case folder name: {case_dir.name} (expected <speciesID>_<authorID> or case_<speciesID>_<authorID>)")
         return problems
 
-    base = re.sub(r"^case_", "", case_dir.name)
-    for _, png in list_pngs_sorted(case_dir):
-        m = FILE_RE.match(png.name)
-        if not m:
-            problems.append(f"[{case_dir.name}] Bad file name: {png.name} (expected <type>_<speciesID>_<authorID>_XX.png)")
+    base = case_dir.name.removeprefix("case_")
+    pngs, _, txts = list_pngs_sorted(case_dir.path)
+    for _, name, path, groups in pngs:
+        if not groups:
+            problems.append(f"[{case_dir.name}] Bad file name: {name} (expected <type>_<speciesID>_<authorID>_XX.png)")
             continue
-        t, sp, au, xx = m.groups()
+        t, sp, au, xx = groups
         if f"{sp}_{au}" != base:
-            problems.append(f"[{case_dir.name}] Folder and file disagree: {png.name}")
-        if not png.with_suffix(".txt").exists():
-            problems.append(f"[{case_dir.name}] Missing caption TXT for {png.name}")
+            problems.append(f"[{case_dir.name}] Folder and file disagree: {name}")
+        if path[:-4] + ".txt" not in txts:
+            problems.append(f"[{case_dir.name}] Missing caption TXT for {name}")
     return problems  # mixed types are fine
 
-def build_data():
-    categories = {slug: {"slug": slug, "name": slug[:1].upper() + slug[1:], "description": "", "coverImage": None, "cases": []}
-                  for slug in SLUG_ORDER}
+def process_case(case_dir: os.DirEntry) -> list[tuple[int, dict]]:
+    """Build the (TYPE_IDX, case) pairs for one folder, one per type present."""
+    # group images by type within the folder
+    images_by_type = [[] for _ in TYPES]
+    pngs, covers, txts = list_pngs_sorted(case_dir.path)
+    for _, name, path, groups in pngs:
+        if not groups:
+            continue
+        t, sp, au, xx = groups
+        images_by_type[TYPE_IDX[t]].append(Img(rel(path), f"{sp}_{au} {xx}", caption_for(path, txts)))
+
+    # emit one case per type present
+    cases = []
+    for idx, images in enumerate(images_by_type):
+        if not images:
+            continue
+
+        cover_typed = f"cover_{TYPES[idx]}.png"
+        if cover_typed in covers:
+            cover_rel = rel(os.path.join(case_dir.path, cover_typed))
+        elif "cover.png" in covers:
+            cover_rel = rel(os.path.join(case_dir.path, "cover.png"))
+        else:
+            cover_rel = images[0].src
+
+        cases.append((idx, {
+            "slug": case_dir.name,
+            "name": human_case_name(case_dir.name),
+            "description": "",
+            "coverImage": cover_rel,
+            "images": [{"src": i.src, "alt": i.alt, "caption": i.caption} for i in images]
+        }))
+    return cases
+
+def build_data(warn: bool = True):
+    cases_by_idx = [[] for _ in SLUG_ORDER]
 
     if not IMG_DIR.exists():
         raise SystemExit("images/ directory not found")
 
-    for case_dir in sorted([p for p in IMG_DIR.iterdir() if p.is_dir()], key=lambda p: p.name.lower()):
-        # group images by type within the folder
-        images_by_type = {"inversion": [], "translocation": [], "duplication": []}
-        for _, png in list_pngs_sorted(case_dir):
-            m = FILE_RE.match(png.name)
-            if not m: 
-                continue
-            t, sp, au, xx = m.groups()
-            t = t.lower()
-            images_by_type[t].append({
-                "src": rel(png),
-                "alt": f"{sp}_{au} {xx}",
-                "caption": caption_for(png),
-                "order": int(xx),
-            })
-
-        # emit one case per type present
-        for t, images in images_by_type.items():
-            if not images:
-                continue
-            cat_slug = TYPE_TO_SLUG[t]
-
-            cover_typed = case_dir / f"cover_{t}.png"
-            cover_generic = case_dir / "cover.png"
-            if cover_typed.exists():
-                cover_rel = rel(cover_typed)
-            elif cover_generic.exists():
-                cover_rel = rel(cover_generic)
-            else:
-                cover_rel = images[0]["src"]
-
-            for img in images:
-                img.pop("order", None)
-
-            categories[cat_slug]["cases"].append({
-                "slug": case_dir.name,
-                "name": human_case_name(case_dir.name),
-                "description": "",
-                "coverImage": cover_rel,
-                "images": images
-            })
+    # folders are independent and the work is mostly scandir/open/read, so overlap it;
+    # ex.map keeps the sorted folder order for the merge below
+    case_dirs = list_case_dirs()
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as ex:
+        for case_dir, cases in zip(case_dirs, ex.map(process_case, case_dirs)):
+            # validation reuses the folder scan cached by process_case
+            probs = validate_case(case_dir) if warn else []
+            if probs:
+                print("WARNING:")
+                for p in probs:
+                    print(" -", p)
+            for idx, case in cases:
+                cases_by_idx[idx].append(case)
 
     out_categories = []
-    for slug in SLUG_ORDER:
-        cat = categories[slug]
-        cat["cases"].sort(key=lambda c: c["slug"].lower())
-        if cat["cases"] and not cat["coverImage"]:
-            cat["coverImage"] = cat["cases"][0]["coverImage"]
-        out_categories.append(cat)
+    for slug, cases in zip(SLUG_ORDER, cases_by_idx):
+        cases.sort(key=lambda c: c["slug"].lower())
+        out_categories.append({
+            "slug": slug,
+            "name": slug[:1].upper() + slug[1:],
+            "description": "",
+            "coverImage": cases[0]["coverImage"] if cases else None,
+            "cases": cases,
+        })
 
     data = {
         "title": "Hi-C Gallery",
@@ -138,7 +208,11 @@ def build_data():
         "categories": out_categories,
     }
 
-    (ROOT / "data.json").write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    if orjson is not None:
+        (ROOT / "data.json").write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(ROOT / "data.json", "w", encoding="utf-8") as fp:
+            json.dump(data, fp, ensure_ascii=False, indent=2)
 
     # summary in CI logs
     for cat in out_categories:
@@ -152,7 +226,7 @@ if __name__ == "__main__":
         if not IMG_DIR.exists():
             problems.append("Missing images/ directory.")
         else:
-            for case_dir in [p for p in IMG_DIR.iterdir() if p.is_dir()]:
+            for case_dir in list_case_dirs():
                 problems.extend(validate_case(case_dir))
         if problems:
             print("Validation failed:\\n")
@@ -162,12 +236,5 @@ if __name__ == "__main__":
         print("All good ✅")
         sys.exit(0)
     else:
-        if IMG_DIR.exists():
-            for case_dir in [p for p in IMG_DIR.iterdir() if p.is_dir()]:
-                probs = validate_case(case_dir)
-                if probs:
-                    print("WARNING:")
-                    for p in probs:
-                        print(" -", p)
         build_data()
         print("Wrote data.json")